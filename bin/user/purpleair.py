@@ -38,6 +38,7 @@ Add the following to weewx.conf:
     interval = <how often to fetch data in seconds>
     ### optional
     api_key = <Read API key retrieved from PurpleAir support (contact@purpleair.com)>
+    flush_every = <how many records to accumulate per database transaction; default 1>
 
 [DataBindings]
     [[purpleair_binding]]
@@ -56,14 +57,13 @@ Add the following to weewx.conf:
 
 # FIXME: ...
 
-import sys
 import time
 import requests
+import urllib3
 import configobj
 import threading
-import socket
+import functools
 import math
-import datetime
 
 import weewx
 import weeutil.weeutil
@@ -72,35 +72,56 @@ import weewx.units
 
 WEEWX_PURPLEAIR_VERSION = "0.9"
 
-PY3 = sys.version_info[0] == 3
-
-if PY3:
-    binary_type = bytes
-else:
-    binary_type = str
-
+# Use a C JSON parser when one is available.  msgspec, orjson and ujson
+# parse the response bytes directly, skipping the UTF-8 decode and the
+# per-node allocations of the stdlib parser.  Fall back to the stdlib
+# since this extension ships as pure Python.
+try:
+    import msgspec.json
+    _loads = msgspec.json.decode
+except ImportError:
+    try:
+        import orjson
+        _loads = orjson.loads
+    except ImportError:
+        try:
+            import ujson
+            _loads = ujson.loads
+        except ImportError:
+            import json
+            _loads = json.loads
 
 if weewx.__version__ < "3":
     raise weewx.UnsupportedFeature("weewx 3 is required, found %s" %
                                    weewx.__version__)
 
-# set up appropriate units
-weewx.units.USUnits['group_concentration'] = 'microgram_per_meter_cubed'
-weewx.units.MetricUnits['group_concentration'] = 'microgram_per_meter_cubed'
-weewx.units.MetricWXUnits['group_concentration'] = 'microgram_per_meter_cubed'
-weewx.units.default_unit_format_dict['microgram_per_meter_cubed'] = '%.3f'
-weewx.units.default_unit_label_dict['microgram_per_meter_cubed']  = u'µg/m³'
-
-# assign types of units to specific measurements
-weewx.units.obs_group_dict['purple_temperature'] = 'group_temperature'
-weewx.units.obs_group_dict['purple_humidity'] = 'group_percent'
-weewx.units.obs_group_dict['purple_pressure'] = 'group_pressure'
-weewx.units.obs_group_dict['pm1_0_cf_1'] = 'group_concentration'
-weewx.units.obs_group_dict['pm1_0_atm'] = 'group_concentration'
-weewx.units.obs_group_dict['pm2_5_cf_1'] = 'group_concentration'
-weewx.units.obs_group_dict['pm2_5_atm'] = 'group_concentration'
-weewx.units.obs_group_dict['pm10_0_cf_1'] = 'group_concentration'
-weewx.units.obs_group_dict['pm10_0_atm'] = 'group_concentration'
+# the unit group of each measurement we record
+_OBS_GROUPS = {
+    'purple_temperature': 'group_temperature',
+    'purple_humidity': 'group_percent',
+    'purple_pressure': 'group_pressure',
+    'pm1_0_cf_1': 'group_concentration',
+    'pm1_0_atm': 'group_concentration',
+    'pm2_5_cf_1': 'group_concentration',
+    'pm2_5_atm': 'group_concentration',
+    'pm10_0_cf_1': 'group_concentration',
+    'pm10_0_atm': 'group_concentration',
+    }
+
+# set up appropriate units; guarded so re-importing the module (test
+# harness, extension reload) doesn't rewrite weewx's shared unit dicts
+if 'purple_temperature' not in weewx.units.obs_group_dict:
+    for _unit_dict in (weewx.units.USUnits, weewx.units.MetricUnits,
+                       weewx.units.MetricWXUnits):
+        _unit_dict['group_concentration'] = 'microgram_per_meter_cubed'
+    weewx.units.default_unit_format_dict['microgram_per_meter_cubed'] = '%.3f'
+    weewx.units.default_unit_label_dict['microgram_per_meter_cubed'] = u'µg/m³'
+    weewx.units.obs_group_dict.update(_OBS_GROUPS)
+
+# resolve the mbar -> US pressure conversion to a single multiplier at
+# import time; deriving it from convertStd (rather than hard-coding
+# 0.0295...) keeps us honest if weewx ever remaps group_pressure
+_MBAR_TO_US_PRESSURE = weewx.units.convertStd((1.0, 'mbar', 'group_pressure'), weewx.US)[0]
 
 # our schema
 schema = [
@@ -119,6 +140,14 @@ schema = [
     ('pm10_0_atm','REAL'),
     ]
 
+# the expected database column layout, for the startup sanity check
+_SCHEMA_COLS = tuple(x[0] for x in schema)
+
+# a pre-sized record skeleton; copying it allocates the dict at its
+# final size once instead of growing it one key at a time, and fields
+# the sensor doesn't report simply stay None (NULL in the database)
+_RECORD_TEMPLATE = dict.fromkeys(_SCHEMA_COLS)
+
 
 try:
     # Test for new-style weewx logging by trying to import weeutil.logger
@@ -126,127 +155,219 @@ try:
     import logging
     log = logging.getLogger(__name__)
 
-    def logdbg(msg):
-        log.debug(msg)
-
-    def loginf(msg):
-        log.info(msg)
-
-    def logerr(msg):
-        log.error(msg)
+    # bind straight to the logger methods so a log call is a single
+    # dispatch instead of going through an extra Python frame
+    logdbg = log.debug
+    loginf = log.info
+    logerr = log.error
 
 except ImportError:
     # Old-style weewx logging
     import syslog
 
-    def logmsg(level, msg):
-        syslog.syslog(level, 'purpleair: %s:' % msg)
-
-    def logdbg(msg):
-        logmsg(syslog.LOG_DEBUG, msg)
-
-    def loginf(msg):
-        logmsg(syslog.LOG_INFO, msg)
-
-    def logerr(msg):
-        logmsg(syslog.LOG_ERR, msg)
-
-
-def collect_data(session, hostname, port, timeout, api_key):
-    if isinstance(hostname, binary_type):
+    def logmsg(level, fmt, *args):
+        # defer % formatting until the message is actually emitted,
+        # mirroring the lazy formatting of the logging module above
+        syslog.syslog(level, 'purpleair: %s:' % (fmt % args if args else fmt))
+
+    logdbg = functools.partial(logmsg, syslog.LOG_DEBUG)
+    loginf = functools.partial(logmsg, syslog.LOG_INFO)
+    logerr = functools.partial(logmsg, syslog.LOG_ERR)
+
+
+# particle data older than this many seconds is considered stale and
+# is not recorded
+_VALID_DATA_AGE = 600
+
+# bound the TCP connect phase separately from the body read; on packet
+# loss a connect would otherwise hang for the full configured timeout
+_CONNECT_TIMEOUT = 2
+
+# only the required fields are requested from the PurpleAir website
+# API to save purpleair API points
+_API_FIELDS = ",".join(["temperature", "humidity", "pressure", "last_seen",
+                        "pm1.0_cf_1_a", "pm1.0_cf_1_b",
+                        "pm1.0_atm_a", "pm1.0_atm_b",
+                        "pm2.5_cf_1_a", "pm2.5_cf_1_b",
+                        "pm2.5_atm_a", "pm2.5_atm_b",
+                        "pm10.0_cf_1_a", "pm10.0_cf_1_b",
+                        "pm10.0_atm_a", "pm10.0_atm_b"])
+
+# the concentration counters we record, and the remapping to the
+# dotted spelling the PurpleAir website API uses
+_PM_KEYS = ('pm1_0_cf_1', 'pm1_0_atm', 'pm2_5_cf_1',
+            'pm2_5_atm', 'pm10_0_cf_1', 'pm10_0_atm')
+_REMAP_DOT = {'pm1_0_cf_1': 'pm1.0_cf_1',
+              'pm1_0_atm': 'pm1.0_atm',
+              'pm2_5_cf_1': 'pm2.5_cf_1',
+              'pm2_5_atm': 'pm2.5_atm',
+              'pm10_0_cf_1': 'pm10.0_cf_1',
+              'pm10_0_atm': 'pm10.0_atm'}
+
+# the scalar fields each data source is expected to report, used to
+# complain (once) about anything the sensor left out
+_EXPECTED_WEB_KEYS = ('temperature', 'humidity', 'pressure')
+_EXPECTED_LOCAL_KEYS = ('current_temp_f', 'current_humidity',
+                        'current_dewpoint_f', 'pressure')
+
+# fully resolved (record_key, channel_a_key, channel_b_key) triples so
+# the averaging loops do no remap lookups or string concatenation
+_PM_WEB_AB = tuple((k, _REMAP_DOT[k] + '_a', _REMAP_DOT[k] + '_b')
+                   for k in _PM_KEYS)
+_PM_LOCAL_AB = tuple((k, k, k + '_b') for k in _PM_KEYS)
+
+
+def _average_channels(valA, valB):
+    """Average the A and B channel readings of one counter.
+
+    A channel that reads exactly 0 while the other doesn't is assumed
+    dead and ignored: each zero reading drops the divisor by one, and
+    the guard returns 0 when both channels are zero."""
+    return (valA + valB) / (2.0 - (valA == 0.0) - (valB == 0.0)) if (valA or valB) else 0.0
+
+
+def _fill_pm_website(record, j):
+    """Average the A and B channels of a PurpleAir website response."""
+    record.update((key, _average_channels(float(j[keyA]), float(j[keyB])))
+                  for key, keyA, keyB in _PM_WEB_AB)
+
+
+def _fill_pm_local(record, j):
+    """Average the A and B channels of a local device response."""
+    record.update((key, _average_channels(float(j[keyA]), float(j[keyB])))
+                  for key, keyA, keyB in _PM_LOCAL_AB)
+
+
+def create_session(api_key=None):
+    """Create a requests session that keeps its connections alive.
+
+    Each poll fetches a tiny JSON payload, so the TCP (and for the
+    PurpleAir website, TLS) handshake dominates the per-poll cost.
+    Mounting an adapter with a persistent pool lets subsequent polls
+    reuse the same connection, and asking for gzip shrinks the body."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=2, pool_maxsize=4,
+        max_retries=urllib3.util.Retry(total=2, backoff_factor=0.2,
+                                       status_forcelist=(502, 503, 504)))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Connection': 'keep-alive',
+                            'Accept-Encoding': 'gzip',
+                            'User-Agent': 'weewx-purpleair/%s' % WEEWX_PURPLEAIR_VERSION})
+    # the website API key is constant, so send it as a session header
+    # instead of rebuilding a headers dict on every request
+    if api_key is not None:
+        session.headers['X-API-Key'] = api_key
+    return session
+
+
+def resolve_url(hostname, port):
+    """Resolve the configured hostname into (url, is_website).
+
+    A numeric hostname is a PurpleAir website sensor ID; anything else
+    is the address of a local device.  Done once at startup so the
+    per-poll path does not re-check and re-format the URL."""
+    if isinstance(hostname, bytes):
         hostname = hostname.decode('utf-8')
 
-    # fetching data from www.purpleair.com
     if hostname.isnumeric():
-        # get only required fields to save purpleair API points
-        api_fields = ["temperature", "humidity", "pressure", "last_seen",
-                      "pm1.0_cf_1_a", "pm1.0_cf_1_b",
-                      "pm1.0_atm_a", "pm1.0_atm_b",
-                      "pm2.5_cf_1_a", "pm2.5_cf_1_b",
-                      "pm2.5_atm_a", "pm2.5_atm_b",
-                      "pm10.0_cf_1_a", "pm10.0_cf_1_b",
-                      "pm10.0_atm_a", "pm10.0_atm_b"]
-
-        url = "https://api.purpleair.com/v1/sensors/%s?fields=%s" % (hostname, ",".join(api_fields))
-        r = session.get(url, timeout=timeout, headers= {'X-API-Key': api_key})
-        is_data_from_purpleair_website = True
-
-    # fetching data from local device
+        return "https://api.purpleair.com/v1/sensors/%s?fields=%s" % (hostname, _API_FIELDS), True
+    return "http://%s:%s/json" % (hostname, port), False
+
+
+def collect_data(session, url, is_website, timeout, cache=None):
+    # send the validators from the previous response so an unchanged
+    # payload comes back as a bodyless 304; local device firmware that
+    # doesn't know about conditional requests just ignores them
+    headers = {}
+    if cache is not None:
+        if cache.get('etag'):
+            headers['If-None-Match'] = cache['etag']
+        if cache.get('last_modified'):
+            headers['If-Modified-Since'] = cache['last_modified']
+
+    timeouts = (min(_CONNECT_TIMEOUT, timeout), timeout)
+    if is_website:
+        r = session.get(url, timeout=timeouts, headers=headers)
     else:
-        r = session.get(url="http://%s:%s/json" % (hostname, port), timeout=timeout)
-        is_data_from_purpleair_website = False
+        # stream the local device response so the body can be read in
+        # one shot below instead of accumulated chunk by chunk
+        r = session.get(url, timeout=timeouts, headers=headers, stream=True)
 
-    # update data only when "last_seen/response_date" is not older than 10 minutes - makes sense for purpleair website only
-    valid_timeout = datetime.timedelta(minutes=10)
+    # the sensor hasn't updated; reuse the previous record with a
+    # fresh timestamp and skip the transfer and parse entirely
+    if r.status_code == 304 and cache is not None and cache.get('record'):
+        record = cache['record'].copy()
+        record['dateTime'] = time.time_ns() // 1000000000
+        return record
 
     # raise error if status is invalid
     r.raise_for_status()
-    # convert to json
-    if is_data_from_purpleair_website:
-        rj = r.json()
+    # convert to json; "last_seen/response_date" is an epoch timestamp
+    if is_website:
+        rj = _loads(r.content)
         j = rj['sensor']
-        last_seen = datetime.datetime.utcfromtimestamp(j['last_seen'])
+        last_seen = j['last_seen']
     else:
-        j = r.json()
-        last_seen = datetime.datetime.utcfromtimestamp(j['response_date'])
+        # read the whole payload off the raw stream (decompressed if
+        # the firmware gzipped it) and parse the bytes directly
+        j = _loads(r.raw.read(decode_content=True))
+        last_seen = j['response_date']
 
-    record = dict()
-    record['dateTime'] = int(time.time())
+    record = _RECORD_TEMPLATE.copy()
+    record['dateTime'] = time.time_ns() // 1000000000
     record['usUnits'] = weewx.US
 
-    # put items into record
-    missed = []
+    # put items into record; a field the sensor didn't report stays
+    # None in the record.  bind the bound method once rather than
+    # re-resolving the attribute for every field
+    jget = j.get
+    if is_website:
+        temperature = jget('temperature')
+        humidity = jget('humidity')
+        expected = _EXPECTED_WEB_KEYS
+    else:
+        temperature = jget('current_temp_f')
+        humidity = jget('current_humidity')
+        dewpoint = jget('current_dewpoint_f')
+        record['purple_dewpoint'] = float(dewpoint) if dewpoint is not None else None
+        expected = _EXPECTED_LOCAL_KEYS
 
-    def get_and_update_missed(key):
-        if key in j:
-            return float(j[key])
-        else:
-            missed.append(key)
-            return None
+    record['purple_temperature'] = float(temperature) if temperature is not None else None
+    record['purple_humidity'] = float(humidity) if humidity is not None else None
 
-    if is_data_from_purpleair_website:
-        record['purple_temperature'] = get_and_update_missed('temperature')
-        record['purple_humidity'] = get_and_update_missed('humidity')
-    else:
-        record['purple_temperature'] = get_and_update_missed('current_temp_f')
-        record['purple_humidity'] = get_and_update_missed('current_humidity')
-        record['purple_dewpoint'] = get_and_update_missed('current_dewpoint_f')
-    
-    pressure = get_and_update_missed('pressure')
+    pressure = jget('pressure')
     if pressure is not None:
-        # convert pressure from mbar to US units.
-        # FIXME: is there a cleaner way to do this
-        pressure, units, group = weewx.units.convertStd((pressure, 'mbar', 'group_pressure'), weewx.US)
-        record['purple_pressure'] = pressure
-
-    if missed:
-        loginf("sensor didn't report field(s): %s" % ','.join(missed))
+        # convert pressure from mbar to US units
+        record['purple_pressure'] = float(pressure) * _MBAR_TO_US_PRESSURE
+
+    missed = [key for key in expected if key not in j]
+
+    # only log when the set of missing fields changes; a sensor that is
+    # persistently missing a field shouldn't re-format and re-log the
+    # same message every poll
+    if cache is not None:
+        if missed != cache.get('missed', []):
+            if missed:
+                loginf("sensor didn't report field(s): %s", ','.join(missed))
+            cache['missed'] = missed
+    elif missed:
+        loginf("sensor didn't report field(s): %s", ','.join(missed))
 
     # when last seen field is older than 10 minutes do not return any particle data
-    if datetime.datetime.utcnow() - last_seen < valid_timeout:
+    if time.time() - last_seen < _VALID_DATA_AGE:
         # for each concentration counter grab the average of the A and B channels and push into the record
+        if is_website:
+            _fill_pm_website(record, j)
+        else:
+            _fill_pm_local(record, j)
 
-        # NEWLY are values from PA website json with dot so it´s necessary to remap it
-        remap_dot = {'pm1_0_cf_1':'pm1.0_cf_1',
-                     'pm1_0_atm':'pm1.0_atm',
-                     'pm2_5_cf_1':'pm2.5_cf_1',
-                     'pm2_5_atm':'pm2.5_atm',
-                     'pm10_0_cf_1':'pm10.0_cf_1',
-                     'pm10_0_atm':'pm10.0_atm'}
-
-        for key in ['pm1_0_cf_1', 'pm1_0_atm', 'pm2_5_cf_1', 'pm2_5_atm', 'pm10_0_cf_1', 'pm10_0_atm']:
-            if is_data_from_purpleair_website:
-                valA = float(j[remap_dot[key] + '_a'])
-                valB = float(j[remap_dot[key] + '_b'])
-            else:
-                valA = float(j[key])
-                valB = float(j[key + '_b'])
-            if valA == 0.0 and valB != 0.0:
-                record[key] = valB
-            elif valB == 0.0 and valA != 0.0:
-                record[key] = valA
-            else:
-                record[key] = (valA + valB) / 2.0
+    # remember the record and the response validators for the next poll
+    if cache is not None:
+        cache['record'] = record
+        cache['etag'] = r.headers.get('ETag')
+        cache['last_modified'] = r.headers.get('Last-Modified')
     return record
 
 
@@ -255,7 +376,7 @@ class PurpleAirMonitor(StdService):
 
     def __init__(self, engine, config_dict):
         super(PurpleAirMonitor, self).__init__(engine, config_dict)
-        loginf("service version is %s" % WEEWX_PURPLEAIR_VERSION)
+        loginf("service version is %s", WEEWX_PURPLEAIR_VERSION)
 
         self.config_dict = config_dict.get('PurpleAirMonitor', {})
         try:
@@ -269,21 +390,35 @@ class PurpleAirMonitor(StdService):
         self.config_dict.setdefault('timeout', 10) # url fetch timeout
         self.config_dict.setdefault('interval', 300) # how often to fetch data
         self.config_dict.setdefault('api_key', 'API_KEY') # API_KEY to get data from PurpleAir website
+        self.config_dict.setdefault('flush_every', 1) # how many records to accumulate per database transaction
 
         # get the database parameters we need to function
         binding = self.config_dict.get('data_binding', 'purpleair_binding')
         self.dbm = self.engine.db_binder.get_manager(data_binding=binding, initialize=True)
 
-        # be sure schema in database matches the schema we have
-        dbcol = self.dbm.connection.columnsOf(self.dbm.table_name)
-        dbm_dict = weewx.manager.get_manager_dict(
-            config_dict['DataBindings'],
-            config_dict['Databases'],
-            binding)
+        # be sure schema in database matches the schema we have; the
+        # expected columns come straight from our own schema, so there
+        # is no need to re-parse the weewx config via get_manager_dict
+        dbcol = tuple(self.dbm.connection.columnsOf(self.dbm.table_name))
+        if dbcol != _SCHEMA_COLS:
+            raise Exception('purpleair schema mismatch: %s != %s' % (dbcol, _SCHEMA_COLS))
+
+        # on sqlite, trade the default full-fsync rollback journal for
+        # WAL so a commit is an appending write; a power loss can only
+        # cost the last uncommitted transaction
+        if self.dbm.connection.__class__.__module__ == 'weedb.sqlite':
+            try:
+                cursor = self.dbm.connection.cursor()
+                for pragma in ('journal_mode=WAL', 'synchronous=NORMAL',
+                               'temp_store=MEMORY', 'cache_size=-8000'):
+                    cursor.execute('PRAGMA %s' % pragma)
+                cursor.close()
+            except Exception as e:
+                logdbg("could not set sqlite pragmas: %s", e)
 
-        memcol = [x[0] for x in dbm_dict['schema']]
-        if dbcol != memcol:
-            raise Exception('purpleair schema mismatch: %s != %s' % (dbcol, memcol))
+        # records waiting to be written out in a single transaction
+        self._pending = []
+        self._flush_every = weeutil.weeutil.to_int(self.config_dict['flush_every'])
 
         # listen for NEW_ARCHIVE_RECORDS
         self.bind(weewx.NEW_ARCHIVE_RECORD, self.new_archive_record)
@@ -294,12 +429,15 @@ class PurpleAirMonitor(StdService):
 
     def shutDown(self):
         try:
+            self._flush()
             self.dbm.close()
-        except:
-            pass
+        except Exception as e:
+            # a failed flush loses buffered records, so say so rather
+            # than swallowing it silently
+            logerr("error closing database: %s", e)
 
         if self._thread:
-            self._thread.running = False
+            self._thread.shutDown()
             self._thread.join()
             self._thread = None
 
@@ -311,71 +449,90 @@ class PurpleAirMonitor(StdService):
         else:
             delta = math.fabs(record['dateTime'] - event.record['dateTime'])
             if delta > weeutil.weeutil.to_int(self.config_dict['interval']) * 1.5:
-                logdbg("Skipping record: time difference %f too big" % delta)
+                logdbg("Skipping record: time difference %f too big", delta)
             else:
                 self.save_data(record)
 
     def save_data(self, record):
         """save data to database"""
-        self.dbm.addRecord(record)
+        # buffer records and write them out in one transaction so the
+        # per-commit fsync cost is amortized across the batch
+        self._pending.append(record)
+        if len(self._pending) >= self._flush_every:
+            self._flush()
+
+    def _flush(self):
+        """write any buffered records in a single transaction"""
+        if self._pending:
+            # addRecord accepts an iterable and wraps it in one transaction
+            self.dbm.addRecord(self._pending)
+            self._pending = []
 
 
 
 class PurpleAirMonitorDataThread(threading.Thread):
     def __init__(self, config_dict):
         threading.Thread.__init__(self, name="PurpleAirMonitor")
+        # a poll stuck in the network stack should not keep the
+        # process alive after the engine has shut down
+        self.daemon = True
         self.config_dict = config_dict
-        self._lock = threading.Lock()
+        # signalled when the service shuts down; also used as an
+        # interruptible sleep between polls
+        self._stop_event = threading.Event()
+        # resolve the data source once rather than on every poll
+        self._url, self._is_website = resolve_url(
+            config_dict['hostname'],
+            weeutil.weeutil.to_int(config_dict['port']))
+        self._timeout = weeutil.weeutil.to_int(config_dict['timeout'])
+        self._interval = weeutil.weeutil.to_int(config_dict['interval'])
+        self._interval_minutes = self._interval // 60
+        self._api_key = config_dict['api_key']
         self._record = None
-        self.running = False
+
+    def shutDown(self):
+        self._stop_event.set()
 
     def get_record(self):
-        with self._lock:
-            if not self._record:
-                return None
-            else:
-                return self._record.copy()
+        # single-writer/single-reader handoff: the poller publishes a
+        # brand-new dict on every update and never mutates it after
+        # the assignment, which the GIL makes atomic, so the reader
+        # can take the current reference without a lock or a copy
+        return self._record
 
     def run(self):
-        # starting thread running
-        self.running = True
+        # create a session; the API key only matters for the website
+        session = create_session(self._api_key if self._is_website else None)
 
-        # create a session
-        session = requests.Session()
+        # response validators and the last record, for conditional requests
+        cache = {}
 
-        # keep track of the last time we aquired the data
-        last_ts = None
-        while self.running:
+        while not self._stop_event.is_set():
             try:
-                # if we haven't fetched data before, or the last time we fetched the data was longer than an interval
-                if not last_ts or time.time() - last_ts >= weeutil.weeutil.to_int(self.config_dict['interval']):
-                    record = collect_data(session, self.config_dict['hostname'],
-                                          weeutil.weeutil.to_int(self.config_dict['port']),
-                                          weeutil.weeutil.to_int(self.config_dict['timeout']),
-                                          self.config_dict['api_key'])
-                    record['interval'] = int(weeutil.weeutil.to_int(self.config_dict['interval']) / 60)
-
-                    with self._lock:
-                        self._record = record
-
-                    # store the last time data was fetched successfully
-                    last_ts = time.time()
-
-                time.sleep(1)
-
-            except socket.error as e:
-                loginf("Socket error: %s" % e)
-                time.sleep(weeutil.weeutil.to_int(self.config_dict['interval']))
-            except requests.RequestException as e:
-                loginf("Requests error: %s" % e)
-                time.sleep(weeutil.weeutil.to_int(self.config_dict['interval']))
+                record = collect_data(session, self._url, self._is_website,
+                                      self._timeout, cache)
+                record['interval'] = self._interval_minutes
+
+                # publish the finished record; collect_data always
+                # returns a fresh dict, so earlier snapshots handed to
+                # get_record callers are never touched again
+                self._record = record
+
+            except (requests.RequestException, OSError) as e:
+                # requests wraps most socket errors, but a bare OSError
+                # can still surface from the connection pool
+                loginf("Fetch error (%s): %s", type(e).__name__, e)
             except Exception as e:
-                loginf("Exception: %s" % e)
-                time.sleep(weeutil.weeutil.to_int(self.config_dict['interval']))
+                loginf("Exception: %s", e)
+
+            # sleep until the next poll is due; returns immediately
+            # when shutDown sets the event, so there is no need to wake
+            # every second just to see if we are still running
+            self._stop_event.wait(self._interval)
 
         try:
             session.close()
-        except:
+        except Exception:
             pass
 
 
@@ -423,9 +580,10 @@ if __name__ == "__main__":
             test_service(options.hostname, options.port)
 
     def test_collector(hostname, port, apikey):
-        session = requests.Session()
+        session = create_session(apikey)
+        url, is_website = resolve_url(hostname, port)
         while True:
-            print (collect_data(session, hostname, port, 10, apikey))
+            print (collect_data(session, url, is_website, 10))
             time.sleep(5)
 
     def test_service(hostname, port):
@@ -509,7 +667,7 @@ if __name__ == "__main__":
             finally:
                 try:
                     svc.shutDown()
-                except:
+                except Exception:
                     pass
             engine.shutDown()
 